@@ -28,9 +28,9 @@ False
 """
 
 import base64
+import functools
 import hashlib
 import hmac
-import six
 import struct
 import time
 
@@ -40,6 +40,24 @@ __version_info__ = (1, 0, 1)
 __version__ = '%s.%s.%s' % __version_info__
 __license__ = 'MIT'
 
+# Single-shot HMAC implemented in C (available since Python 3.7), used when the
+# digest method is one of the well-known ones listed below
+_hmac_digest = getattr(hmac, 'digest', None)
+_DIGEST_NAMES = {
+    hashlib.sha1: 'sha1',
+    hashlib.sha224: 'sha224',
+    hashlib.sha256: 'sha256',
+    hashlib.sha384: 'sha384',
+    hashlib.sha512: 'sha512',
+}
+# Truncated HMAC value has 31 bits, so it never has more than 10 digits
+_POW10 = tuple(10 ** i for i in range(11))
+# Characters skipped when given in secret
+_WHITESPACE = b' \t\r\n'
+# Precompiled packers for HMAC message (interval number) and truncated value
+_PACK_Q = struct.Struct('>Q').pack
+_UNPACK_I = struct.Struct('>I').unpack_from
+
 
 def _is_possible_token(token, token_length=6):
     """Determines if given value is acceptable as a token. Used when validating
@@ -62,10 +80,166 @@ def _is_possible_token(token, token_length=6):
     False
     >>> _is_possible_token(b'12345678')
     False
+    >>> _is_possible_token(-12345)
+    False
+    >>> _is_possible_token(True)
+    False
     """
+    # Exact type check, so that bool (subclass of int) is rejected
+    if type(token) is int:
+        # Tokens never exceed 10 digits, see _POW10
+        return 0 <= token < _POW10[min(token_length, 10)]
     if not isinstance(token, bytes):
-        token = six.b(str(token))
-    return token.isdigit() and len(token) <= token_length
+        token = str(token).encode('utf-8')
+    return len(token) <= token_length and token.isdigit()
+
+
+def _decode_secret(secret, casefold=True):
+    """Decode base32-encoded secret into the raw key used for HMAC. Results
+    are cached, as the same secrets are usually decoded over and over again.
+
+    :param secret: the base32-encoded string acting as secret key
+    :type secret: str or unicode
+    :param casefold: True (default), if should accept also lowercase alphabet
+    :type casefold: bool
+    :return: decoded key
+    :rtype: bytes
+
+    >>> _decode_secret(b'MFRG GZDF') == b'abcde'
+    True
+    >>> _decode_secret(b'MFRG\\tGZDF\\n') == b'abcde'
+    True
+    >>> _decode_secret(bytearray(b'MFRGGZDF')) == b'abcde'
+    True
+    """
+    if isinstance(secret, str):
+        # It is unicode, convert it to bytes
+        secret = secret.encode('utf-8')
+    elif not isinstance(secret, bytes):
+        # Mutable buffers (eg. bytearray) are not hashable, so not cacheable
+        secret = bytes(secret)
+    return _decode_secret_bytes(secret, casefold)
+
+
+@functools.lru_cache(maxsize=1024)
+def _decode_secret_bytes(secret, casefold):
+    """Cached part of `_decode_secret()`, accepting only bytes secrets.
+
+    :param secret: the base32-encoded bytes acting as secret key
+    :type secret: bytes
+    :param casefold: if should accept also lowercase alphabet
+    :type casefold: bool
+    :return: decoded key
+    :rtype: bytes
+    """
+    # Get rid of all the spacing:
+    secret = secret.translate(None, _WHITESPACE)
+    try:
+        return base64.b32decode(secret, casefold=casefold)
+    except (TypeError):
+        raise TypeError('Incorrect secret')
+
+
+def _truncate(hmac_digest, modulus):
+    """Dynamically truncate HMAC digest into a token (as described in RFC 4226,
+    section 5.3). The same arithmetic is inlined in `_find_interval()` loop.
+
+    :param hmac_digest: HMAC digest of interval number
+    :type hmac_digest: bytes
+    :param modulus: 10 to the power of token length
+    :type modulus: int
+    :return: token
+    :rtype: int
+
+    >>> _truncate(bytes.fromhex('cc93cf18508d94934c64b65d8ba7667fb7cde4b0'),
+    ...           10 ** 6)
+    755224
+    """
+    o = hmac_digest[19] & 15
+    return (_UNPACK_I(hmac_digest, o)[0] & 0x7fffffff) % modulus
+
+
+def _is_default_hotp(digest_method, token_length):
+    """Determines if `_hotp_sha1_6()` can be used for given parameters.
+
+    :param digest_method: method of generating digest
+    :type digest_method: callable
+    :param token_length: length of the token
+    :type token_length: int
+    :return: True if parameters are defaults and hmac.digest() is available
+    :rtype: bool
+    """
+    return (
+        digest_method is hashlib.sha1 and
+        token_length == 6 and
+        _hmac_digest is not None
+    )
+
+
+def _hotp_sha1_6(key, intervals_no):
+    """Get HOTP token for already decoded key, specialized for the default
+    parameters (SHA-1 digest and 6 digits long token).
+
+    :param key: decoded secret
+    :type key: bytes
+    :param intervals_no: interval number
+    :type intervals_no: int
+    :return: generated HOTP token
+    :rtype: int
+
+    >>> _hotp_sha1_6(b'12345678901234567890', 0)
+    755224
+    """
+    return _truncate(_hmac_digest(key, _PACK_Q(intervals_no), 'sha1'), 1000000)
+
+
+def _find_interval(
+        token,
+        key,
+        intervals_nos,
+        digest_method=hashlib.sha1,
+        token_length=6,
+):
+    """Find first of the given interval numbers, for which the token matches
+    the one generated from the key. Used when validating tokens.
+
+    HMAC key schedule is the same for every interval number, so it is prepared
+    only once and copied for each of them. Tokens are compared as zero-padded
+    strings in constant time, so the comparison does not leak how many digits
+    of the token were correct.
+
+    :param token: token being checked
+    :type token: int
+    :param key: decoded secret
+    :type key: bytes
+    :param intervals_nos: interval numbers to check, in order
+    :type intervals_nos: iterable of int
+    :param digest_method: method of generating digest (hashlib.sha1 by default)
+    :type digest_method: callable
+    :param token_length: length of the token (6 by default)
+    :type token_length: int
+    :return: matching interval number, or None if not found
+    :rtype: int or None
+
+    >>> _find_interval(713385, b'abcdefghij', [3, 4, 5])
+    4
+    >>> _find_interval(713385, b'abcdefghij', [5, 6]) is None
+    True
+    """
+    modulus = _POW10[min(token_length, 10)]
+    expected = b'%0*d' % (token_length, token)
+    # Key schedule is done once, then the keyed object is copied per message
+    copy_hmac = hmac.new(key, b'', digest_method).copy
+    for interv_no in intervals_nos:
+        hmac_obj = copy_hmac()
+        hmac_obj.update(_PACK_Q(interv_no))
+        hmac_digest = hmac_obj.digest()
+        # Inlined _truncate(), as this is the hottest loop of the module:
+        o = hmac_digest[19] & 15
+        candidate = (_UNPACK_I(hmac_digest, o)[0] & 0x7fffffff) % modulus
+        if hmac.compare_digest(b'%0*d' % (token_length, candidate), expected):
+            return interv_no
+    return None
 
 
 def get_hotp(
@@ -104,28 +278,72 @@ def get_hotp(
     >>> result == b'816065'
     True
     """
-    if isinstance(secret, six.string_types):
-        # It is unicode, convert it to bytes
-        secret = secret.encode('utf-8')
-    # Get rid of all the spacing:
-    secret = secret.replace(b' ', b'')
-    try:
-        key = base64.b32decode(secret, casefold=casefold)
-    except (TypeError):
-        raise TypeError('Incorrect secret')
-    msg = struct.pack('>Q', intervals_no)
-    hmac_digest = hmac.new(key, msg, digest_method).digest()
-    ob = hmac_digest[19] if six.PY3 else ord(hmac_digest[19])
-    o = ob & 15
-    token_base = struct.unpack('>I', hmac_digest[o:o + 4])[0] & 0x7fffffff
-    token = token_base % (10 ** token_length)
+    key = _decode_secret(secret, casefold)
+    if _is_default_hotp(digest_method, token_length):
+        token = _hotp_sha1_6(key, intervals_no)
+    else:
+        msg = _PACK_Q(intervals_no)
+        digest_name = _DIGEST_NAMES.get(digest_method)
+        if _hmac_digest is not None and digest_name is not None:
+            hmac_digest = _hmac_digest(key, msg, digest_name)
+        else:
+            hmac_digest = hmac.new(key, msg, digest_method).digest()
+        token = _truncate(hmac_digest, _POW10[min(token_length, 10)])
     if as_string:
         # TODO: should as_string=True return unicode, not bytes?
-        return six.b('{{:0{}d}}'.format(token_length).format(token))
+        return b'%0*d' % (token_length, token)
     else:
         return token
 
 
+def get_hotp_range(
+        secret,
+        start,
+        count,
+        as_string=False,
+        casefold=True,
+        digest_method=hashlib.sha1,
+        token_length=6,
+):
+    """Get HMAC-based one-time passwords for a range of consecutive interval
+    numbers. Equivalent to calling `get_hotp()` for each of them, but HMAC
+    key schedule is prepared only once.
+
+    :param secret: the base32-encoded string acting as secret key
+    :type secret: str or unicode
+    :param start: first interval number
+    :type start: int
+    :param count: number of interval numbers
+    :type count: int
+    :param as_string: True if result should be padded strings, False otherwise
+    :type as_string: bool
+    :param casefold: True (default), if should accept also lowercase alphabet
+    :type casefold: bool
+    :param digest_method: method of generating digest (hashlib.sha1 by default)
+    :type digest_method: callable
+    :param token_length: length of the token (6 by default)
+    :type token_length: int
+    :return: generated HOTP tokens, for interval numbers start, start + 1, ...
+    :rtype: list of int or list of str
+
+    >>> get_hotp_range(b'MFRGGZDFMZTWQ2LK', start=1, count=2)
+    [765705, 816065]
+    """
+    modulus = _POW10[min(token_length, 10)]
+    copy_hmac = hmac.new(
+        _decode_secret(secret, casefold),
+        b'',
+        digest_method,
+    ).copy
+    tokens = []
+    for interv_no in range(start, start + count):
+        hmac_obj = copy_hmac()
+        hmac_obj.update(_PACK_Q(interv_no))
+        token = _truncate(hmac_obj.digest(), modulus)
+        tokens.append(b'%0*d' % (token_length, token) if as_string else token)
+    return tokens
+
+
 def get_totp(
         secret,
         as_string=False,
@@ -206,16 +424,66 @@ def valid_hotp(
     """
     if not _is_possible_token(token, token_length=token_length):
         return False
-    for i in six.moves.xrange(last + 1, last + trials + 1):
-        token_candidate = get_hotp(
-            secret=secret,
-            intervals_no=i,
+    interv_no = _find_interval(
+        int(token),
+        _decode_secret(secret, True),
+        range(last + 1, last + trials + 1),
+        digest_method=digest_method,
+        token_length=token_length,
+    )
+    return False if interv_no is None else interv_no
+
+
+def valid_hotp_batch(
+        requests,
+        trials=1000,
+        digest_method=hashlib.sha1,
+        token_length=6,
+        workers=None,
+):
+    """Check many HMAC-based tokens at once, eg. when authenticating a burst
+    of users on the server. Return list of results of `valid_hotp()` for
+    every request, in the same order as requests.
+
+    Requests are checked in the calling thread, unless number of workers is
+    given. Distributing checks over a thread pool pays off only when threads
+    run in parallel (eg. on free-threaded builds of Python).
+
+    :param requests: (token, secret, last) triples, as passed to valid_hotp()
+    :type requests: iterable of tuple
+    :param trials: number of intervals to check after 'last'
+    :type trials: int
+    :param digest_method: method of generating digest (hashlib.sha1 by default)
+    :type digest_method: callable
+    :param token_length: length of the token (6 by default)
+    :type token_length: int
+    :param workers: number of threads to check requests in (None by default,
+        meaning checks are done in the calling thread)
+    :type workers: int or None
+    :return: interval number, or False if check unsuccessful, for each request
+    :rtype: list of int or bool
+
+    >>> secret = b'MFRGGZDFMZTWQ2LK'
+    >>> valid_hotp_batch([(713385, secret, 1), (713385, secret, 4)], trials=5)
+    [4, False]
+    """
+    def check(request):
+        token, secret, last = request
+        return valid_hotp(
+            token,
+            secret,
+            last=last,
+            trials=trials,
             digest_method=digest_method,
             token_length=token_length,
         )
-        if token_candidate == int(token):
-            return i
-    return False
+
+    if workers is None:
+        return [check(request) for request in requests]
+    # Imported lazily, to keep it off the module import time
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check, requests))
 
 
 def valid_totp(
@@ -261,23 +529,40 @@ def valid_totp(
     >>> valid_totp(token + b'1', secret)
     False
     """
+    if window < 0:
+        # No intervals to check, so no token can be valid
+        return False
     if _is_possible_token(token, token_length=token_length):
         if clock is None:
             clock = time.time()
-        for w in range(-window, window+1):
-            if int(token) == get_totp(
-                secret,
-                digest_method=digest_method,
-                token_length=token_length,
-                interval_length=interval_length,
-                clock=int(clock)+(w*interval_length)
-            ):
-                return True
+        interv_no = int(clock) // interval_length
+        if not window and _is_default_hotp(digest_method, token_length):
+            # Single token to generate, so no need to prepare HMAC object
+            candidate = _hotp_sha1_6(_decode_secret(secret, True), interv_no)
+            return hmac.compare_digest(
+                b'%06d' % candidate,
+                b'%06d' % int(token),
+            )
+        # Most tokens match the current interval or one of its neighbours,
+        # so check intervals outwards from the current one: 0, 1, -1, 2, ...
+        intervals_nos = [interv_no]
+        for w in range(1, window + 1):
+            intervals_nos += [interv_no + w, interv_no - w]
+        interv_no = _find_interval(
+            int(token),
+            _decode_secret(secret, True),
+            intervals_nos,
+            digest_method=digest_method,
+            token_length=token_length,
+        )
+        return interv_no is not None
     return False
 
 __all__ = [
     'get_hotp',
+    'get_hotp_range',
     'get_totp',
     'valid_hotp',
+    'valid_hotp_batch',
     'valid_totp'
 ]
@@ -30,11 +30,8 @@ setup(
         'Intended Audience :: Telecommunications Industry',
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
-        'Programming Language :: Python :: 2.6',
-        'Programming Language :: Python :: 2.7',
-        'Programming Language :: Python :: 3.2',
-        'Programming Language :: Python :: 3.3',
-        'Programming Language :: Python :: 3.4',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.5',
         'Topic :: Internet :: WWW/HTTP :: Session',
         'Topic :: Internet :: WWW/HTTP :: Site Management',
         'Topic :: Security',
@@ -43,14 +40,11 @@ setup(
     ],
     description='Module for generating and validating HOTP and TOTP tokens',
     download_url='https://github.com/tadeck/onetimepass/archive/v1.0.0.tar.gz',
-    install_requires=[
-        # TODO: Assign it dynamically based on requirements.txt file content
-        'six',  # tested with 1.3.0 and 1.9.0
-    ],
     license='MIT',
     long_description=open(os.path.join(CURRENT_DIR, 'README.rst')).read(),
     name='onetimepass',
     packages=['onetimepass'],
+    python_requires='>=3.5',
     url='https://github.com/tadeck/onetimepass/',
     version='1.0.1',
 )
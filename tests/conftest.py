@@ -0,0 +1,16 @@
+"""
+pytest configuration for ``onetimepass`` tests
+"""
+import pytest
+
+from . import SECRET
+
+
+@pytest.fixture(scope='session', autouse=True)
+def warm_up():
+    """
+    Generate a single token before running tests, so the import and first
+    call costs are not attributed to whichever test happens to run first
+    """
+    from onetimepass import get_hotp
+    get_hotp(SECRET, 1)
@@ -0,0 +1,185 @@
+"""
+Tests for HOTP generation and validation in ``onetimepass`` module
+"""
+import hashlib
+
+import pytest
+
+from onetimepass import (
+    get_hotp, get_hotp_range, get_totp, valid_hotp, valid_hotp_batch,
+)
+
+from . import DIGEST_METHODS, FROZEN, HOTP_1, HOTP_2, SECRET, SECRET_U
+
+
+@pytest.mark.parametrize('intervals_no,expected', [
+    (1, HOTP_1),
+    (2, HOTP_2),
+])
+def test_hotp_generation(intervals_no, expected):
+    """
+    Check if HOTP is generated properly for different intervals
+    """
+    assert get_hotp(SECRET, intervals_no) == expected
+
+
+@pytest.mark.parametrize('intervals_no,expected', [
+    (1, b'765705'),
+    (19, b'088239'),  # token with leading zero
+])
+def test_hotp_generation_as_string(intervals_no, expected):
+    """
+    Check if HOTP returned as string is zero-padded integer token
+    """
+    assert get_hotp(SECRET, intervals_no, as_string=True) == expected
+
+
+def test_hotp_generation_from_unicode_secret():
+    """
+    Check if HOTP is properly generated for unicode secrets
+    """
+    assert get_hotp(SECRET_U, 1) == HOTP_1
+
+
+def test_ignoring_spaces_in_secret():
+    """
+    Check if spaces are skipped during generation of the token
+    """
+    secret_with_spaces = 'MFR GGZ DFM ZTW Q2L K'
+    # Check if was properly sliced:
+    assert secret_with_spaces.count(' ') == 5
+    # Secret with spaces should give the same as spaceless secret
+    assert get_hotp(secret_with_spaces, 1) == HOTP_1
+
+
+def test_ignoring_other_whitespace_in_secret():
+    """
+    Check if tabs and line breaks are skipped like spaces
+    """
+    assert get_hotp('MFRG\tGZDF\r\nMZTW Q2LK\n', 1) == HOTP_1
+
+
+@pytest.mark.parametrize('digest_method', DIGEST_METHODS)
+def test_generation_for_different_digest_methods(digest_method):
+    """
+    Check if well-known digest methods give the same tokens as any other
+    callable wrapping them
+    """
+    assert get_hotp(SECRET, 3, digest_method=digest_method) == get_hotp(
+        SECRET, 3, digest_method=lambda *args: digest_method(*args),
+    )
+
+
+def test_generation_for_range_of_intervals():
+    """
+    Check if HOTPs generated for a range of intervals are the same as the
+    ones generated one by one
+    """
+    assert get_hotp_range(SECRET, start=1, count=10) == [
+        get_hotp(SECRET, i) for i in range(1, 11)
+    ]
+    assert get_hotp_range(
+        SECRET, start=1, count=2, as_string=True,
+        digest_method=hashlib.sha256, token_length=8,
+    ) == [
+        get_hotp(
+            SECRET, i, as_string=True,
+            digest_method=hashlib.sha256, token_length=8,
+        )
+        for i in (1, 2)
+    ]
+
+
+def test_checking_hotp_validity_without_range():
+    """
+    Check if validating HOTP without giving any interval works properly
+    """
+    assert valid_hotp(get_hotp(SECRET, 123), SECRET)
+
+
+def test_unicode_secret_round_trip():
+    """
+    Validity check should also work if secret passed to valid_hotp is
+    unicode, and tokens should not depend on the type of the secret.
+    """
+    assert valid_hotp(get_hotp(SECRET_U, 123), SECRET) == 123
+    assert valid_hotp(get_hotp(SECRET, 123), SECRET_U) == 123
+
+
+def test_bytearray_secret():
+    """
+    Secret given as bytearray (not hashable) should produce the same tokens
+    as the equivalent bytes secret.
+    """
+    assert get_hotp(bytearray(SECRET), 123) == get_hotp(SECRET, 123)
+    assert valid_hotp(get_hotp(SECRET, 123), bytearray(SECRET)) == 123
+
+
+def test_validating_correct_hotp_after_exhaustion():
+    """
+    Validating token created for old interval number should fail
+    """
+    # Act as if the given token was created for previous interval
+    assert not valid_hotp(get_hotp(SECRET, 123), SECRET, last=123)
+
+
+def test_validating_correct_totp_as_hotp():
+    """
+    Check if valid TOTP will work as HOTP - should not work, unless for
+    very big interval number (matching Unix epoch timestamp)
+    """
+    assert not valid_hotp(get_totp(SECRET, clock=FROZEN), SECRET)
+
+
+def test_retrieving_proper_interval_from_validator():
+    """
+    Check, if returns valid interval when checking the valid HOTP
+    """
+    totp = 713385
+    result = valid_hotp(totp, SECRET, last=1, trials=5)
+    # Should be 4, as HOTP is valid for 4th interval
+    assert result == 4
+    # Re-generate HOTP for that interval and check again
+    assert get_hotp(SECRET, intervals_no=4) == totp
+
+
+@pytest.mark.parametrize('digest_method', DIGEST_METHODS)
+def test_checking_hotp_validity_for_different_digest_methods(digest_method):
+    """
+    Check if validation works the same for well-known digest methods and
+    other callables wrapping them
+    """
+    token = get_hotp(SECRET, 123, digest_method=digest_method)
+    assert valid_hotp(token, SECRET, digest_method=digest_method) == 123
+    assert valid_hotp(
+        token, SECRET, digest_method=lambda *args: digest_method(*args),
+    ) == 123
+
+
+def test_hotp_for_range_preceding_match():
+    """
+    Check behaviour of validation of values that precede the proper
+    interval value
+    """
+    assert not valid_hotp(713385, SECRET, last=1, trials=2)
+
+
+def test_checking_batch_of_hotps():
+    """
+    Check if results are the same as from valid_hotp(), in the same order
+    """
+    requests = [
+        (get_hotp(SECRET, 123), SECRET, 1),
+        (get_hotp(SECRET, 123), SECRET, 123),
+        (713385, SECRET, 1),
+        (b'abcdef', SECRET, 1),
+    ]
+    assert valid_hotp_batch(requests) == [123, False, 4, False]
+
+
+def test_checking_batch_of_hotps_in_threads():
+    """
+    Check if distributing checks over threads preserves order of results
+    """
+    requests = [(get_hotp(SECRET, i), SECRET, 1) for i in range(2, 12)]
+    assert valid_hotp_batch(requests, workers=4) == list(range(2, 12))
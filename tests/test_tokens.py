@@ -0,0 +1,65 @@
+"""
+Tests for assessing potential validity of tokens, aimed at limiting data
+processing to validating only non-malformed tokens.
+"""
+import pytest
+
+from onetimepass import _is_possible_token
+
+# Token payloads for preliminary checks
+VALID_INT = 123456
+VALID_BYTES = b'123456'
+VALID_STR = '123456'
+INVALID_ALPHA_B = b'abcdef'
+INVALID_LONG_B = b'12345678'
+INVALID_ALPHA_S = 'abcdef'
+INVALID_LONG_S = '12345678'
+
+
+@pytest.mark.parametrize('token,expected', [
+    # Properly formatted tokens:
+    (VALID_INT, True),  # integer
+    (1234, True),  # integer for token with leading zeros ("001234")
+    (VALID_BYTES, True),  # bytes
+    (VALID_STR, True),  # unicode
+    # Malformed tokens:
+    (INVALID_ALPHA_B, False),  # token with invalid characters
+    (INVALID_LONG_B, False),  # token being too long
+    (-12345, False),  # negative integer
+    (True, False),  # bool, despite being a subclass of int
+    # similar cases as above, but for unicode
+    (INVALID_ALPHA_S, False),
+    (INVALID_LONG_S, False),
+])
+def test_is_possible_token_helper(token, expected):
+    """
+    Checks ``_is_possible_token`` helper method for valid behaviour
+    """
+    assert _is_possible_token(token) == expected
+
+
+def test_default_length_in_possible_tokens():
+    """
+    Check if tokens longer than default length of 6 are rejected
+    """
+    assert not _is_possible_token(1234567)
+
+
+@pytest.mark.parametrize('token,token_length,expected', [
+    # Longer version:
+    (1234567, 7, True),
+    # Shorter version, when longer is allowed:
+    (VALID_INT, 7, True),
+    (VALID_BYTES, 7, True),
+    (VALID_STR, 7, True),
+    # Too long for default length, but not when longer is allowed:
+    (INVALID_LONG_B, 8, True),
+    (INVALID_LONG_S, 8, True),
+    # Invalid token with correct length:
+    ('abcdefg', 7, False),
+])
+def test_variable_length_in_possible_tokens(token, token_length, expected):
+    """
+    Check if length is respected when verifying tokens
+    """
+    assert _is_possible_token(token, token_length=token_length) == expected
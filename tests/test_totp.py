@@ -0,0 +1,107 @@
+"""
+Tests for TOTP generation and validation in ``onetimepass`` module
+"""
+from unittest import mock
+
+from onetimepass import get_hotp, get_totp, valid_totp
+
+from . import CURRENT_INTERVAL, FROZEN, HOTP_1, SECRET
+
+
+def test_generating_current_totp_and_validating():
+    """
+    Check if TOTP generated for current time is the same as manually
+    created HOTP for proper interval
+    """
+    hotp = get_hotp(secret=SECRET, intervals_no=CURRENT_INTERVAL)
+    with mock.patch('time.time', return_value=FROZEN):
+        totp = get_totp(secret=SECRET)
+    assert hotp == totp
+
+
+def test_generating_current_totp_as_string():
+    """
+    Check if the TOTP also works seamlessly when generated as string
+    """
+    hotp = get_hotp(
+        secret=SECRET,
+        intervals_no=CURRENT_INTERVAL,
+        as_string=True,
+    )
+    totp = get_totp(secret=SECRET, as_string=True, clock=FROZEN)
+    assert hotp == totp
+
+
+def test_generating_totp_at_specific_clock():
+    """
+    check if the totp can be generated for a specific clock
+    which is basically the same as hotp
+    """
+    hotp = get_hotp(secret=SECRET, intervals_no=CURRENT_INTERVAL)
+    totp = get_totp(secret=SECRET, clock=FROZEN)
+    assert hotp == totp
+
+    # hotp intervals minus 1
+    hotp = get_hotp(secret=SECRET, intervals_no=CURRENT_INTERVAL-1)
+    # totp 30 seconds in the past
+    totp = get_totp(secret=SECRET, clock=(FROZEN-30))
+    assert hotp == totp
+
+
+def test_validating_totp_with_a_window():
+    """
+    validate if a totp token falls within a certain window
+    """
+    totp = get_totp(secret=SECRET, clock=(FROZEN-30))
+    assert not valid_totp(totp, SECRET, clock=FROZEN)
+    assert valid_totp(totp, SECRET, clock=FROZEN, window=1)
+
+    totp = get_totp(secret=SECRET, clock=(FROZEN+30))
+    assert not valid_totp(totp, SECRET, clock=FROZEN)
+    assert valid_totp(totp, SECRET, clock=FROZEN, window=1)
+
+    totp = get_totp(secret=SECRET, clock=(FROZEN-60))
+    assert not valid_totp(totp, SECRET, clock=FROZEN)
+    assert not valid_totp(totp, SECRET, clock=FROZEN, window=1)
+    assert valid_totp(totp, SECRET, clock=FROZEN, window=2)
+
+
+def test_validating_totp_with_a_negative_window():
+    """
+    Negative window leaves no intervals to check, so even the current TOTP
+    should not be accepted
+    """
+    totp = get_totp(secret=SECRET, clock=FROZEN)
+    assert not valid_totp(totp, SECRET, clock=FROZEN, window=-1)
+
+
+def test_validating_totp_for_same_secret():
+    """
+    Check if validating TOTP generated for the same secret works
+    """
+    totp = get_totp(SECRET, clock=FROZEN)
+    assert valid_totp(totp, SECRET, clock=FROZEN)
+
+
+def test_validating_current_totp():
+    """
+    Check if TOTP is validated against current time by default
+    """
+    with mock.patch('time.time', return_value=FROZEN):
+        assert valid_totp(get_totp(SECRET), SECRET)
+
+
+def test_validating_invalid_totp_for_same_secret():
+    """
+    Test case when the same secret is used, but the token differs
+    """
+    totp = get_totp(SECRET, clock=FROZEN)
+    assert not valid_totp(totp+1, SECRET, clock=FROZEN)
+
+
+def test_validating_correct_hotp_as_totp():
+    """
+    Check if valid TOTP will work as HOTP - should not work, unless for
+    very big interval number (matching Unix epoch timestamp)
+    """
+    assert not valid_totp(HOTP_1, SECRET, clock=FROZEN)